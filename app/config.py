@@ -1,38 +1,64 @@
-from dotenv import load_dotenv; load_dotenv()
+from functools import lru_cache
+from pathlib import Path
 
-import os
-from pydantic import BaseModel, ValidationError
+from pydantic import Field, ValidationError, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-class Settings(BaseModel):
+class Settings(BaseSettings):
     """Application configuration loaded from environment variables.
 
     This model centralizes configuration values for the FastAPI
     application, the LLM client, and database connections. It uses
-    Pydantic to parse and validate environment variables with sensible
-    defaults. Flags are provided to toggle between real external
-    services and local in-memory/mocked implementations for testing.
+    Pydantic settings to parse and validate environment variables with
+    sensible defaults. Values missing from the environment are read from
+    the ``.env`` file at the repository root, whatever the working
+    directory. Flags are provided to toggle between real
+    external services and local in-memory/mocked implementations for
+    testing.
     """
 
+    model_config = SettingsConfigDict(
+        env_file=Path(__file__).resolve().parent.parent / ".env", extra="ignore"
+    )
+
     APP_NAME: str = "LLM Knowledge Extractor"
     API_PREFIX: str = "/api"
-    ENV: str = os.getenv("ENV", "dev")
+    ENV: str = "dev"
+
+    GOOGLE_API_KEY: str | None = None
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+
+    SUPABASE_URL: str | None = None
+    SUPABASE_ANON_KEY: str | None = None
+    SUPABASE_TABLE: str = "analyses"
+
+    LLM_MAX_CONCURRENCY: int = Field(default=16, ge=1)
+    MAX_BATCH_ITEMS: int = Field(default=100, ge=1)
 
-    GOOGLE_API_KEY: str | None = os.getenv("GOOGLE_API_KEY")
-    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    USE_MOCK_LLM: bool = False
+    USE_INMEM_DB: bool = False
 
-    SUPABASE_URL: str | None = os.getenv("SUPABASE_URL")
-    SUPABASE_ANON_KEY: str | None = os.getenv("SUPABASE_ANON_KEY")
-    SUPABASE_TABLE: str = os.getenv("SUPABASE_TABLE", "analyses")
+    @field_validator("USE_MOCK_LLM", "USE_INMEM_DB", mode="before")
+    @classmethod
+    def _parse_flag(cls, value: object) -> bool:
+        """Treat only ``true`` (any case) as enabled; anything else is off.
 
-    USE_MOCK_LLM: bool = os.getenv("USE_MOCK_LLM", "false").lower() == "true"
-    USE_INMEM_DB: bool = os.getenv("USE_INMEM_DB", "false").lower() == "true"
+        This matches how the flags were read before settings moved to
+        pydantic-settings, so blank or unexpected values disable the
+        flag instead of failing startup.
+        """
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() == "true"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Instantiate and return application settings.
 
-    If environment variables are invalid, a RuntimeError is raised to
+    The settings object is built once and shared by every caller. If
+    environment variables are invalid, a RuntimeError is raised to
     highlight misconfiguration early in application startup.
     """
     try:
@@ -0,0 +1,38 @@
+"""FastAPI dependencies exposing the process-wide service clients.
+
+The database backend, LLM client, analysis cache and LLM concurrency
+limiter are created once in the application lifespan and stored on ``app.state``. Routes receive them
+through these dependencies instead of module-level globals, which keeps
+imports free of side effects and lets tests swap them on the app. The
+cache holds records from the current backend, so it is swapped along
+with ``db``.
+"""
+
+import asyncio
+from collections import OrderedDict
+
+from fastapi import Request
+
+from app.models import Analysis
+from app.services.db import InMemoryDB, SupabaseDB
+from app.services.llm import LLMClient
+
+
+def get_db(request: Request) -> InMemoryDB | SupabaseDB:
+    """Return the database backend shared by the application."""
+    return request.app.state.db
+
+
+def get_llm(request: Request) -> LLMClient:
+    """Return the LLM client shared by the application."""
+    return request.app.state.llm
+
+
+def get_analysis_cache(request: Request) -> OrderedDict[bytes, Analysis]:
+    """Return the LRU cache of analyses keyed by text hash."""
+    return request.app.state.analysis_cache
+
+
+def get_llm_limiter(request: Request) -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent LLM calls across requests."""
+    return request.app.state.llm_limiter
\ No newline at end of file
@@ -1,17 +1,41 @@
 """FastAPI application initialization module."""
 
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
 from app.routers import analyze, search
+from app.services.db import create_db
+from app.services.llm import LLMClient
 
 
 settings = get_settings()
 
 
-app = FastAPI(title=settings.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared service clients and release them on shutdown."""
+    app.state.db = create_db()
+    app.state.llm = LLMClient()
+    app.state.analysis_cache = OrderedDict()
+    app.state.llm_limiter = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    yield
+    await app.state.llm.aclose()
+
+
+app = FastAPI(
+    title=settings.APP_NAME, lifespan=lifespan, default_response_class=ORJSONResponse
+)
 
+# CORS stays app-wide. Server-to-server callers send no Origin header,
+# which CORSMiddleware forwards untouched, so the analyze routes are not
+# split into a CORS-free sub-app: a mount would sit inside this
+# middleware anyway and add its own exception-handling layers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
@@ -31,6 +55,7 @@ def root() -> dict[str, dict[str, str]]:
         "name": settings.APP_NAME,
         "endpoints": {
             "POST /api/analyze": "Analyze single text or batch.",
+            "POST /api/analyze/stream": "Analyze texts, streaming results as SSE.",
             "GET /api/search?topic=xyz": "Search analyses by topic or keyword.",
         },
     }
\ No newline at end of file
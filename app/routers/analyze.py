@@ -1,50 +1,119 @@
 """Routes implementing the /analyze API endpoint."""
 
-from typing import List
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
+from app.config import get_settings
+from app.dependencies import get_analysis_cache, get_db, get_llm, get_llm_limiter
 from app.models import AnalyzeRequest, AnalyzeResponse, Analysis
 from app.services.keywords import extract_top3_nouns_like
 from app.services.llm import LLMClient
-from app.services.db import get_db
+from app.services.db import InMemoryDB, SupabaseDB
 import math
 
 
 router = APIRouter()
 
-llm_client = LLMClient()
-db = get_db()
+_FAILURE_SUMMARY = "LLM unavailable. Summary could not be generated."
+_FAILURE_TOPICS = ("general", "unknown", "llm-failure")
 
+_CACHE_MAX_SIZE = 1024
 
-def _confidence_heuristic(text: str, llm_ok: bool) -> float:
-    """Compute a naive confidence score for a given text.
+_STREAM_ERROR_DATA = '{"detail": "Analysis could not be completed."}'
+
+# Length bonus per word count, min(0.30, log10(n + 9) / 10). The bonus
+# saturates once n + 9 reaches 1000, so every larger count maps to the
+# last entry.
+_LENGTH_BONUS_SATURATION = 991
+_LENGTH_BONUS = tuple(
+    min(0.30, math.log10(n + 9) / 10.0) for n in range(_LENGTH_BONUS_SATURATION + 1)
+)
+
+
+class EventStreamResponse(StreamingResponse):
+    """Streaming response documented as ``text/event-stream`` in OpenAPI.
+
+    Caching is disabled and ``X-Accel-Buffering: no`` is sent so reverse
+    proxies such as nginx forward each event immediately instead of
+    buffering the stream.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, content: Any, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> None:
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})}
+        super().__init__(content, headers=headers, **kwargs)
+
+
+def _confidence_heuristic(n_words: int, llm_ok: bool) -> float:
+    """Compute a naive confidence score for a text of ``n_words`` words.
 
     The heuristic starts from a base of 0.55 and grows with the
     logarithm of the number of words, saturating at +0.30. A small
     bonus is added if the LLM successfully responded. Scores are
     clamped to the range [0.5, 0.98].
     """
-    n = max(1, len(text.split()))
-    length_bonus = min(0.30, math.log10(n + 9) / 10.0)
+    n = max(1, n_words)
+    length_bonus = _LENGTH_BONUS[min(n, _LENGTH_BONUS_SATURATION)]
     llm_bonus = 0.10 if llm_ok else 0.0
     conf = 0.55 + length_bonus + llm_bonus
     return max(0.50, min(0.98, round(conf, 3)))
 
 
-def _analyze_single(text: str) -> Analysis:
-    """Process a single piece of text and return an Analysis object.
+def _cache_key(text: str) -> bytes:
+    """Return the LRU cache key for an already stripped text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _cache_get(cache: OrderedDict[bytes, Analysis], text: str) -> Optional[Analysis]:
+    """Return a copy of the cached analysis for ``text``, if any."""
+    key = _cache_key(text)
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    cache.move_to_end(key)
+    return cached.model_copy(deep=True)
+
+
+def _to_analysis(
+    cache: OrderedDict[bytes, Analysis], text: str, saved: Dict[str, Any], llm_ok: bool
+) -> Analysis:
+    """Build the Analysis for a persisted row and cache successful ones."""
+    # ``saved`` is the row we just built, echoed back by our own store,
+    # so construction skips validation here. The route's response_model
+    # still validates the whole response once before it is serialized.
+    result = Analysis.model_construct(**saved)
+    if llm_ok:
+        cache[_cache_key(text)] = result
+        if len(cache) > _CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+    return result
+
+
+async def _build_row(
+    t: str, llm: LLMClient, limiter: asyncio.Semaphore
+) -> Tuple[Dict[str, Any], bool]:
+    """Compute the analysis row for a stripped, non-empty text.
 
     This function coordinates keyword extraction, LLM calls for
-    summary and metadata, computes a confidence score, persists the
-    record, and returns the resulting Analysis. Exceptions from the
-    LLM are caught and handled gracefully.
+    summary and metadata (fused into a single request), and computes a
+    confidence score. The LLM call waits on ``limiter``, which is shared
+    across requests, so a large batch cannot flood Gemini or exhaust the
+    HTTP connection pool. Exceptions from the LLM are caught and handled
+    gracefully. Returns the unsaved row and whether the LLM succeeded.
+    Persisting the row is left to the caller so batches can be
+    inserted together.
     """
-    t = (text or "").strip()
-    if not t:
-        raise HTTPException(status_code=400, detail="Empty input text.")
-
     keywords = extract_top3_nouns_like(t)
+    # Count whitespace-separated words rather than keyword tokens, which
+    # skip one-letter and non-ASCII words.
+    n_words = len(t.split())
 
     summary = ""
     title = None
@@ -52,20 +121,23 @@ def _analyze_single(text: str) -> Analysis:
     sentiment = "neutral"
     llm_ok = True
     try:
-        summary = llm_client.summarize(t)
-        meta = llm_client.extract_metadata(t)
+        async with limiter:
+            meta = await llm.analyze_all(t)
+        summary = meta["summary"]
         title = meta.get("title")
         topics = meta.get("topics", [])
         sentiment = meta.get("sentiment", "neutral")
     except Exception:
 
         llm_ok = False
-        summary = "LLM unavailable. Summary could not be generated."
+        summary = _FAILURE_SUMMARY
         title = None
-        topics = ["general", "unknown", "llm-failure"]
+        # Saved rows become Analysis objects via model_construct, which
+        # does not coerce the tuple, and stored rows must not share a list.
+        topics = list(_FAILURE_TOPICS)
         sentiment = "neutral"
 
-    confidence = _confidence_heuristic(t, llm_ok)
+    confidence = _confidence_heuristic(n_words, llm_ok)
 
     row = {
         "title": title,
@@ -76,17 +148,16 @@ def _analyze_single(text: str) -> Analysis:
         "confidence": confidence,
         "text": t,
     }
-    saved = db.insert_analysis(row)
-    return Analysis(**saved)
+    return row, llm_ok
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
-def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
-    """Endpoint to analyze single or batch texts.
+def _input_texts(payload: AnalyzeRequest) -> List[str]:
+    """Validate the request payload and return its stripped texts.
 
-    At least one of ``text`` or ``items`` must be provided. Batch
-    processing is supported via the ``items`` list. Validation is
-    performed to ensure non-empty inputs. Returns a list of results.
+    At least one of ``text`` or ``items`` must be provided, a batch must
+    be a non-empty list of at most ``MAX_BATCH_ITEMS`` texts, and every
+    text must be non-empty. Violations raise HTTP 400 before any
+    analysis work starts.
     """
     items: List[str] = []
     if payload.items is not None:
@@ -95,6 +166,12 @@ def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
                 status_code=400,
                 detail="Batch 'items' must be a non-empty list of strings.",
             )
+        max_items = get_settings().MAX_BATCH_ITEMS
+        if len(payload.items) > max_items:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch 'items' may contain at most {max_items} texts.",
+            )
         items = payload.items
     elif payload.text is not None:
         items = [payload.text]
@@ -103,7 +180,122 @@ def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
             status_code=400, detail="Provide 'text' or 'items' with data."
         )
 
-    results: List[Analysis] = []
-    for t in items:
-        results.append(_analyze_single(t))
-    return AnalyzeResponse(results=results)
\ No newline at end of file
+    texts = [(t or "").strip() for t in items]
+    if not all(texts):
+        raise HTTPException(status_code=400, detail="Empty input text.")
+    return texts
+
+
+def _group_by_text(
+    texts: List[str], indices: Iterable[int]
+) -> Dict[bytes, Tuple[str, List[int]]]:
+    """Group input positions by cache key so repeated texts run once."""
+    groups: Dict[bytes, Tuple[str, List[int]]] = {}
+    for i in indices:
+        groups.setdefault(_cache_key(texts[i]), (texts[i], []))[1].append(i)
+    return groups
+
+
+async def _analyze_single(
+    t: str,
+    db: InMemoryDB | SupabaseDB,
+    llm: LLMClient,
+    cache: OrderedDict[bytes, Analysis],
+    limiter: asyncio.Semaphore,
+) -> Analysis:
+    """Analyze and persist one stripped text unless it is cached."""
+    cached = _cache_get(cache, t)
+    if cached is not None:
+        return cached
+    row, llm_ok = await _build_row(t, llm, limiter)
+    saved = await asyncio.to_thread(db.insert_analysis, row)
+    return _to_analysis(cache, t, saved, llm_ok)
+
+
+@router.post("/analyze", response_model=AnalyzeResponse)
+async def analyze(
+    payload: AnalyzeRequest,
+    db: InMemoryDB | SupabaseDB = Depends(get_db),
+    llm: LLMClient = Depends(get_llm),
+    cache: OrderedDict[bytes, Analysis] = Depends(get_analysis_cache),
+    limiter: asyncio.Semaphore = Depends(get_llm_limiter),
+) -> AnalyzeResponse:
+    """Endpoint to analyze single or batch texts.
+
+    At least one of ``text`` or ``items`` must be provided. Batch
+    processing is supported via the ``items`` list and all items are
+    analyzed concurrently. Validation is performed to ensure non-empty
+    inputs. Successful analyses are kept in a bounded LRU cache keyed
+    by a hash of the text; a repeated text returns a copy of the stored
+    record without calling the LLM or inserting a duplicate row, and a
+    text repeated within the batch is analyzed and stored once. The
+    remaining rows are persisted with one batched insert. Returns a
+    list of results in input order.
+    """
+    texts = _input_texts(payload)
+
+    results: List[Optional[Analysis]] = [_cache_get(cache, t) for t in texts]
+    pending = _group_by_text(texts, (i for i, r in enumerate(results) if r is None))
+    groups = list(pending.values())
+    built = await asyncio.gather(*(_build_row(t, llm, limiter) for t, _ in groups))
+    if built:
+        # The Supabase client is synchronous; keep its round-trip off the
+        # event loop so other requests progress meanwhile.
+        saved_rows = await asyncio.to_thread(db.insert_analyses, [row for row, _ in built])
+        for (t, indices), (_, llm_ok), saved in zip(groups, built, saved_rows):
+            result = _to_analysis(cache, t, saved, llm_ok)
+            for i in indices:
+                results[i] = result
+    return AnalyzeResponse(results=results)
+
+
+@router.post("/analyze/stream", response_class=EventStreamResponse)
+async def analyze_stream(
+    payload: AnalyzeRequest,
+    db: InMemoryDB | SupabaseDB = Depends(get_db),
+    llm: LLMClient = Depends(get_llm),
+    cache: OrderedDict[bytes, Analysis] = Depends(get_analysis_cache),
+    limiter: asyncio.Semaphore = Depends(get_llm_limiter),
+) -> EventStreamResponse:
+    """Endpoint streaming analyses as Server-Sent Events.
+
+    Accepts the same payload as ``/analyze``. Each result is sent as
+    soon as it completes, so clients see the first analysis after one
+    LLM round-trip instead of waiting for the whole batch. Events arrive
+    in completion order; the SSE ``id`` field carries the index of the
+    input text and ``data`` is the Analysis as JSON; a repeated text is
+    analyzed once and emitted for each of its positions. Rows are
+    persisted individually since they are emitted one by one. If a row
+    cannot be stored, an ``error`` event is sent for its positions and
+    the stream continues. Work still pending when the client
+    disconnects is cancelled.
+    """
+    texts = _input_texts(payload)
+
+    async def analyze_group(
+        t: str, indices: List[int]
+    ) -> Tuple[List[int], Optional[Analysis]]:
+        try:
+            return indices, await _analyze_single(t, db, llm, cache, limiter)
+        except Exception as exc:
+            logging.exception("Streaming analysis failed: %s", exc)
+            return indices, None
+
+    async def event_stream() -> AsyncIterator[str]:
+        groups = _group_by_text(texts, range(len(texts))).values()
+        tasks = [asyncio.create_task(analyze_group(t, indices)) for t, indices in groups]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, analysis = await next_done
+                if analysis is None:
+                    for index in indices:
+                        yield f"event: error\nid: {index}\ndata: {_STREAM_ERROR_DATA}\n\n"
+                    continue
+                data = analysis.model_dump_json()
+                for index in indices:
+                    yield f"id: {index}\ndata: {data}\n\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return EventStreamResponse(event_stream())
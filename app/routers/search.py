@@ -2,20 +2,21 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 
+from app.dependencies import get_db
 from app.models import SearchResponse, Analysis
-from app.services.db import get_db
+from app.services.db import InMemoryDB, SupabaseDB
 
 
 router = APIRouter()
 
 
-db = get_db()
-
-
 @router.get("/search", response_model=SearchResponse)
-def search(topic: Optional[str] = Query(default=None, description="Topic or keyword to match.")) -> SearchResponse:
+def search(
+    topic: Optional[str] = Query(default=None, description="Topic or keyword to match."),
+    db: InMemoryDB | SupabaseDB = Depends(get_db),
+) -> SearchResponse:
     """Endpoint to search analyses by topic or keyword.
 
     The ``topic`` query parameter is matched against both the
@@ -23,5 +24,8 @@ def search(topic: Optional[str] = Query(default=None, description="Topic or keyw
     omitted, all analyses are returned (limited by backend).
     """
     rows = db.search(topic or "")
-    results = [Analysis(**r) for r in rows]
+    # Rows come from our own store, so construction skips validation
+    # here. response_model still validates the response once before it
+    # is serialized, which leaves one validation pass instead of two.
+    results = [Analysis.model_construct(**r) for r in rows]
     return SearchResponse(results=results)
\ No newline at end of file
@@ -9,21 +9,34 @@ environment variables defined in the application settings.
 from __future__ import annotations
 
 import uuid
+from collections import defaultdict
 from typing import Any, Dict, List
 
 from app.config import get_settings
 
 
-settings = get_settings()
-
-_supabase = None
-if not settings.USE_INMEM_DB:
+def _create_supabase_client() -> Any:
+    """Create a Supabase client, or return None if it is unavailable."""
+    settings = get_settings()
     try:
         from supabase import create_client  
         if settings.SUPABASE_URL and settings.SUPABASE_ANON_KEY:
-            _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
+            return create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
     except Exception:
-        _supabase = None
+        pass
+    return None
+
+
+def _pg_array_literal(value: str) -> str:
+    """Quote ``value`` as a one-element Postgres array literal.
+
+    The element is double-quoted with backslashes and quotes escaped so
+    commas, dots and parentheses cannot break out of a PostgREST filter.
+    Braces are dropped because PostgREST delimits array values by them.
+    """
+    cleaned = value.replace("{", "").replace("}", "")
+    escaped = cleaned.replace("\\", "\\\\").replace('"', '\\"')
+    return '{"' + escaped + '"}'
 
 
 class InMemoryDB:
@@ -31,29 +44,37 @@ class InMemoryDB:
 
     This class stores analyses in a Python list. It assigns a UUID if
     one is not provided and supports a basic search by topic or keyword.
+    Lowercased topics and keywords are indexed on insert, mapping each
+    term to the positions of the rows containing it, so a search is a
+    dictionary lookup rather than a scan over every row.
     """
 
     def __init__(self) -> None:
         self._rows: list[dict] = []
+        self._by_topic: defaultdict[str, set[int]] = defaultdict(set)
+        self._by_keyword: defaultdict[str, set[int]] = defaultdict(set)
 
     def insert_analysis(self, row: Dict[str, Any]) -> Dict[str, Any]:
         item = dict(row)
         if not item.get("id"):
             item["id"] = str(uuid.uuid4())
+        idx = len(self._rows)
         self._rows.append(item)
+        for t in item.get("topics", []):
+            self._by_topic[str(t).lower()].add(idx)
+        for k in item.get("keywords", []):
+            self._by_keyword[str(k).lower()].add(idx)
         return item
 
+    def insert_analyses(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.insert_analysis(row) for row in rows]
+
     def search(self, topic: str) -> List[Dict[str, Any]]:
         q = (topic or "").lower().strip()
         if not q:
             return list(self._rows)
-        results = []
-        for r in self._rows:
-            topics = [str(t).lower() for t in r.get("topics", [])]
-            keywords = [str(k).lower() for k in r.get("keywords", [])]
-            if q in topics or q in keywords:
-                results.append(r)
-        return results
+        matches = self._by_topic.get(q, set()) | self._by_keyword.get(q, set())
+        return [self._rows[i] for i in sorted(matches)]
 
 
 class SupabaseDB:
@@ -61,15 +82,17 @@ class SupabaseDB:
 
     This class relies on the Supabase Python client to insert and
     query analyses from a Postgres table. It uses array ``contains``
-    semantics for searching topics and keywords.
+    semantics for searching topics and keywords, combined into a single
+    ``or`` filter so each search is one round-trip.
     """
 
     def __init__(self, table_name: str) -> None:
-        if _supabase is None:
+        client = _create_supabase_client()
+        if client is None:
             raise RuntimeError(
                 "Supabase client not initialized. Check SUPABASE_URL and SUPABASE_ANON_KEY."
             )
-        self.client = _supabase
+        self.client = client
         self.table = table_name
 
     def insert_analysis(self, row: Dict[str, Any]) -> Dict[str, Any]:
@@ -79,6 +102,13 @@ class SupabaseDB:
             return data[0]
         raise RuntimeError(f"Supabase insert failed: {res}")
 
+    def insert_analyses(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        res = self.client.table(self.table).insert(rows).execute()
+        data = getattr(res, "data", None)
+        if data and len(data) == len(rows):
+            return data
+        raise RuntimeError(f"Supabase batch insert failed: {res}")
+
     def search(self, topic: str) -> List[Dict[str, Any]]:
         q = (topic or "").strip()
         if not q:
@@ -91,27 +121,25 @@ class SupabaseDB:
             )
             return getattr(res, "data", []) or []
 
-        topics_res = self.client.table(self.table).select("*").contains("topics", [q]).execute()
-        keywords_res = (
-            self.client.table(self.table).select("*").contains("keywords", [q]).execute()
+        array = _pg_array_literal(q)
+        res = (
+            self.client.table(self.table)
+            .select("*")
+            .or_(f"topics.cs.{array},keywords.cs.{array}")
+            .order("created_at", desc=True)
+            .limit(100)
+            .execute()
         )
-        ids: set[str] = set()
-        results: list[dict] = []
-        for row in getattr(topics_res, "data", []) or []:
-            rid = row.get("id")
-            if rid not in ids:
-                ids.add(rid)
-                results.append(row)
-        for row in getattr(keywords_res, "data", []) or []:
-            rid = row.get("id")
-            if rid not in ids:
-                ids.add(rid)
-                results.append(row)
-        return results
-
-
-def get_db() -> InMemoryDB | SupabaseDB:
-    """Return the appropriate database backend based on settings."""
+        return getattr(res, "data", []) or []
+
+
+def create_db() -> InMemoryDB | SupabaseDB:
+    """Return the appropriate database backend based on settings.
+
+    Each call builds a new backend; the application creates one at
+    startup and shares it through ``app.state``.
+    """
+    settings = get_settings()
     if settings.USE_INMEM_DB:
         return InMemoryDB()
     return SupabaseDB(settings.SUPABASE_TABLE)
\ No newline at end of file
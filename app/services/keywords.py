@@ -9,6 +9,7 @@ length. Results are deterministic and suitable for small articles
 where approximate noun extraction suffices.
 """
 
+import heapq
 import re
 from collections import Counter
 from typing import List
@@ -29,7 +30,9 @@ _STOPWORDS = {
     "between", "out", "up", "down", "off", "above", "below", "because",
     "until", "after", "before", "during", "each", "few", "more", "most",
     "other", "some", "such", "only", "own", "same", "s", "t", "d",
-    "ll", "m", "o", "re", "ve", "y", "don", "shouldn", "now",
+    "ll", "m", "o", "re", "ve", "y", "don", "shouldn", "now", "ain",
+    "aren", "couldn", "didn", "doesn", "hadn", "hasn", "haven", "isn",
+    "mightn", "mustn", "needn", "shan", "wasn", "weren", "won", "wouldn",
 }
 
 
@@ -43,7 +46,12 @@ _COMMON_VERBS = {
 }
 
 
-_WORD_RE = re.compile(r"[A-Za-z][A-Za-z\-']+")
+_EXCLUDE = frozenset(_STOPWORDS | _COMMON_VERBS)
+
+
+# Group 1 is the word itself; a trailing possessive ('s or ’s) is matched
+# but left out of the group, and other apostrophes end the word.
+_WORD_RE = re.compile(r"([A-Za-z][A-Za-z\-]+)(?:['’]s\b)?")
 
 
 def extract_top3_nouns_like(text: str) -> List[str]:
@@ -69,24 +77,20 @@ def extract_top3_nouns_like(text: str) -> List[str]:
     if not text or not text.strip():
         return []
 
-    tokens = _WORD_RE.findall(text)
-    if not tokens:
-        return []
-
-    cleaned: list[str] = []
-    for tok in tokens:
-        base = tok.lower().rstrip("'").rstrip("’")
-        if base.endswith("'s") or base.endswith("’s"):
-            base = base[:-2]
-        if base in _STOPWORDS or base in _COMMON_VERBS or len(base) < 3:
+    counts: Counter[str] = Counter()
+    caps: set[str] = set()
+    for match in _WORD_RE.finditer(text):
+        raw = match.group(1)
+        base = raw.lower()
+        if len(base) < 3 or base in _EXCLUDE:
             continue
-        cleaned.append(base)
+        if raw[:1].isupper() and raw[1:].islower():
+            caps.add(base)
+        counts[base] += 1
 
-    if not cleaned:
+    if not counts:
         return []
 
-    caps = {tok.lower() for tok in tokens if tok[:1].isupper() and tok[1:].islower()}
-    counts = Counter(cleaned)
     scored: list[tuple[str, float, int]] = []
     for word, freq in counts.items():
         bonus = 0.25 if word in caps else 0.0
@@ -94,11 +98,5 @@ def extract_top3_nouns_like(text: str) -> List[str]:
         score = freq + bonus + length_bonus
         scored.append((word, score, freq))
 
-    scored.sort(key=lambda x: (-x[1], -x[2], x[0]))
-    top: list[str] = []
-    for w, _, _ in scored:
-        if w not in top:
-            top.append(w)
-        if len(top) == 3:
-            break
-    return top
\ No newline at end of file
+    best = heapq.nsmallest(3, scored, key=lambda x: (-x[1], -x[2], x[0]))
+    return [w for w, _, _ in best]
\ No newline at end of file
@@ -2,33 +2,38 @@
 
 This module abstracts interactions with Google's Gemini generative
 models. It supports switching between real API calls and a mock
-implementation for testing. The client exposes high-level methods for
-summarizing text and extracting structured metadata. When using the
-mock, deterministic values are returned for unit test stability.
+implementation for testing. Real calls go to the Gemini REST API
+through one pooled HTTP/2 client that is reused across requests. The
+client exposes a single high-level method that summarizes text and
+extracts structured metadata in one call. When using the mock,
+deterministic values are returned for unit test stability.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import re
 from typing import Any, Dict
 
-from app.config import get_settings
+import httpx
+import orjson
 
+from app.config import get_settings
 
-settings = get_settings()
 
+_GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
 
-_SUMMARY_PROMPT = (
-    "You are a precise assistant. Summarize the user's text in 1–3 sentences."
-    " Be concise and neutral."
-)
 
-_META_PROMPT = (
-    "Extract the following as pure JSON (no extra text):\n"
-    "{\n  \"title\": string|null,\n  \"topics\": string[3],\n  \"sentiment\": \"positive\"|\"neutral\"|\"negative\"\n}\n"
+_ANALYZE_PROMPT = (
+    "You are a precise assistant. Analyze the user's text and return pure JSON"
+    " (no extra text):\n"
+    "{\n  \"summary\": string,\n  \"title\": string|null,\n  \"topics\": string[3],\n"
+    "  \"sentiment\": \"positive\"|\"neutral\"|\"negative\"\n}\n"
     "Rules:\n"
+    "- \"summary\" summarizes the text in 1–3 sentences; be concise and neutral.\n"
     "- \"title\" should be a short title if one can be inferred; otherwise null.\n"
     "- \"topics\" must be exactly 3 short, general themes.\n"
     "- \"sentiment\" is overall tone (positive/neutral/negative).\n"
@@ -36,71 +41,94 @@ _META_PROMPT = (
 )
 
 
+def _parse_json_response(raw: str) -> Dict[str, Any]:
+    """Parse a JSON object from an LLM response, stripping code fences.
+
+    Parsing uses orjson; if it rejects the payload, the lenient stdlib
+    parser is tried so control characters inside strings (e.g. raw
+    newlines in a summary) do not fail the whole response.
+    """
+    cleaned = _FENCE_RE.sub("", raw).strip()
+    try:
+        return orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
+        return json.loads(cleaned, strict=False)
+
+
+def _normalize_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce title, topics and sentiment from parsed JSON into safe values."""
+    title = data.get("title") if isinstance(data.get("title"), (str, type(None))) else None
+    topics = data.get("topics") or []
+    sentiment = data.get("sentiment") or "neutral"
+    topics = [t for t in topics if isinstance(t, str)]
+    if len(topics) >= 3:
+        topics = topics[:3]
+    else:
+        topics = (topics + ["general"] * 3)[:3]
+    if sentiment not in {"positive", "neutral", "negative"}:
+        sentiment = "neutral"
+    return {"title": title, "topics": topics, "sentiment": sentiment}
+
+
 class LLMClient:
     """Thin wrapper around Gemini generative models or a mock implementation."""
 
     def __init__(self) -> None:
+        settings = get_settings()
         self.use_mock = settings.USE_MOCK_LLM
+        self._client: httpx.AsyncClient | None = None
         if not self.use_mock:
             if not settings.GOOGLE_API_KEY:
                 raise RuntimeError("GOOGLE_API_KEY is required to use the Gemini client.")
-            import google.generativeai as genai  
-
-            genai.configure(api_key=settings.GOOGLE_API_KEY)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
-
-    def summarize(self, text: str) -> str:
-        """Generate a concise summary using the LLM.
-
-        If the client is configured to mock the LLM, a fixed string is
-        returned. Otherwise, the Gemini API is invoked with the
-        summary prompt followed by user text. On error, the exception is
-        propagated to the caller.
+            self._url = _GEMINI_URL.format(model=settings.GEMINI_MODEL)
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=30.0,
+                headers={"x-goog-api-key": settings.GOOGLE_API_KEY},
+            )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was created."""
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _generate(self, prompt: str, text: str) -> str:
+        """Send the prompt and user text to Gemini and return the reply text.
+
+        Raises if the HTTP request fails or the response carries no
+        candidate (e.g. it was blocked by safety filters).
         """
-        if self.use_mock:
-            return "This is a mock summary of the provided text."
-        try:
-            response = self.model.generate_content([_SUMMARY_PROMPT, text])
-            return (response.text or "").strip()
-        except Exception as exc:
-            logging.exception("LLM summarize failed: %s", exc)
-            raise
-
-    def extract_metadata(self, text: str) -> Dict[str, Any]:
-        """Extract title, topics and sentiment from text using the LLM.
-
-        The model is instructed to return a JSON object only. If the
-        response includes fencing (e.g., ```json) it is stripped before
-        parsing. Invalid or missing fields are normalized to sensible
-        defaults. When the LLM is mocked, a constant payload is
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}, {"text": text}]}]}
+        response = await self._client.post(self._url, json=body)
+        response.raise_for_status()
+        parts = orjson.loads(response.content)["candidates"][0]["content"]["parts"]
+        return "".join(p.get("text", "") for p in parts).strip()
+
+    async def analyze_all(self, text: str) -> Dict[str, Any]:
+        """Generate summary, title, topics and sentiment in one LLM call.
+
+        The model is instructed to return a JSON object only, so each
+        text costs one round-trip and one copy of the input tokens. If
+        the response includes fencing (e.g., ```json) it is stripped
+        before parsing. Invalid or missing metadata fields are
+        normalized to sensible defaults; a missing summary raises so the
+        caller falls back. When the LLM is mocked, a constant payload is
         returned.
         """
         if self.use_mock:
             return {
+                "summary": "This is a mock summary of the provided text.",
                 "title": None,
                 "topics": ["technology", "ai", "engineering"],
                 "sentiment": "neutral",
             }
         try:
-            response = self.model.generate_content([_META_PROMPT, text])
-            raw = (response.text or "").strip()
-            cleaned = raw
-            if cleaned.startswith("```"):
-                cleaned = cleaned.strip("`")
-                if cleaned.startswith("json"):
-                    cleaned = cleaned[4:]
-            data = json.loads(cleaned)
-            title = data.get("title") if isinstance(data.get("title"), (str, type(None))) else None
-            topics = data.get("topics") or []
-            sentiment = data.get("sentiment") or "neutral"
-            topics = [t for t in topics if isinstance(t, str)]
-            if len(topics) >= 3:
-                topics = topics[:3]
-            else:
-                topics = (topics + ["general"] * 3)[:3]
-            if sentiment not in {"positive", "neutral", "negative"}:
-                sentiment = "neutral"
-            return {"title": title, "topics": topics, "sentiment": sentiment}
+            data = _parse_json_response(await self._generate(_ANALYZE_PROMPT, text))
+            summary = data.get("summary")
+            if not isinstance(summary, str) or not summary.strip():
+                raise ValueError("LLM response is missing a summary.")
+            return {"summary": summary.strip(), **_normalize_metadata(data)}
         except Exception as exc:
-            logging.exception("LLM extract_metadata failed: %s", exc)
+            logging.exception("LLM analyze_all failed: %s", exc)
             raise
\ No newline at end of file
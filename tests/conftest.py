@@ -1,6 +1,8 @@
 """Pytest configuration for API integration tests."""
 
 import os
+from typing import Iterator
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -12,6 +14,11 @@ from app.main import app
 
 
 @pytest.fixture(scope="session")
-def client() -> TestClient:
-    """Yield a TestClient for interacting with the FastAPI app."""
-    return TestClient(app)
\ No newline at end of file
+def client() -> Iterator[TestClient]:
+    """Yield a TestClient for interacting with the FastAPI app.
+
+    The client is used as a context manager so the app lifespan runs and
+    the shared database and LLM clients are created.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
\ No newline at end of file
@@ -1,7 +1,14 @@
 """Integration tests for API endpoints using TestClient."""
 
+import asyncio
+from collections import OrderedDict
+
 from fastapi.testclient import TestClient
 
+from app.models import AnalyzeRequest
+from app.routers.analyze import analyze, analyze_stream
+from app.services.db import InMemoryDB
+
 
 def test_analyze_single(client: TestClient) -> None:
     payload = {"text": "This article discusses LLM systems and their impact on engineering productivity."}
@@ -33,4 +40,151 @@ def test_search_roundtrip(client: TestClient) -> None:
     res = client.get("/api/search?topic=ai")
     assert res.status_code == 200
     results = res.json()["results"]
-    assert isinstance(results, list)
\ No newline at end of file
+    assert isinstance(results, list)
+
+
+def test_analyze_repeated_text_is_cached(client: TestClient) -> None:
+    payload = {"text": "Caching analyses avoids repeated calls for identical inputs."}
+    first = client.post("/api/analyze", json=payload).json()["results"][0]
+    second = client.post("/api/analyze", json=payload).json()["results"][0]
+    assert first["id"] == second["id"]
+    assert first == second
+
+
+def test_analyze_batch_with_empty_item_error(client: TestClient) -> None:
+    payload = {"items": ["A valid text about compilers.", "  "]}
+    res = client.post("/api/analyze", json=payload)
+    assert res.status_code == 400
+
+
+def test_analyze_stream_emits_event_per_item(client: TestClient) -> None:
+    payload = {"items": ["Streaming text about networks.", "Streaming text about storage."]}
+    res = client.post("/api/analyze/stream", json=payload)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    assert res.headers["cache-control"] == "no-cache"
+    assert res.headers["x-accel-buffering"] == "no"
+    events = [e for e in res.text.split("\n\n") if e]
+    assert sorted(e.split("\n")[0] for e in events) == ["id: 0", "id: 1"]
+    assert all("data: " in e for e in events)
+
+
+def test_search_finds_analyzed_keyword(client: TestClient) -> None:
+    client.post("/api/analyze", json={"text": "Kubernetes clusters schedule Kubernetes workloads."})
+    res = client.get("/api/search?topic=KUBERNETES")
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert results and all("kubernetes" in r["keywords"] for r in results)
+
+
+def test_swapped_backend_does_not_serve_stale_cache(client: TestClient) -> None:
+    payload = {"text": "Swapping the backend starts from an empty analysis cache."}
+    old_id = client.post("/api/analyze", json=payload).json()["results"][0]["id"]
+    state = client.app.state
+    saved_db, saved_cache = state.db, state.analysis_cache
+    state.db, state.analysis_cache = InMemoryDB(), OrderedDict()
+    try:
+        new_id = client.post("/api/analyze", json=payload).json()["results"][0]["id"]
+        assert new_id != old_id
+        assert [r["id"] for r in state.db.search("")] == [new_id]
+    finally:
+        state.db, state.analysis_cache = saved_db, saved_cache
+
+
+def test_analyze_batch_repeated_item_stored_once(client: TestClient) -> None:
+    text = "Same text about Rust ownership."
+    res = client.post("/api/analyze", json={"items": [text, text]})
+    assert res.status_code == 200
+    first, second = res.json()["results"]
+    assert first["id"] == second["id"]
+    stored = [r for r in client.app.state.db.search("") if r["text"] == text]
+    assert len(stored) == 1
+
+
+def test_analyze_stream_repeated_item_stored_once(client: TestClient) -> None:
+    text = "Same streamed text about Zig allocators."
+    res = client.post("/api/analyze/stream", json={"items": [text, text]})
+    events = [e for e in res.text.split("\n\n") if e]
+    assert sorted(e.split("\n")[0] for e in events) == ["id: 0", "id: 1"]
+    assert len({e.split("\n")[1] for e in events}) == 1
+    stored = [r for r in client.app.state.db.search("") if r["text"] == text]
+    assert len(stored) == 1
+
+
+class _FailingInsertDB(InMemoryDB):
+    def insert_analysis(self, row: dict) -> dict:
+        raise RuntimeError("insert failed")
+
+
+def test_analyze_stream_emits_error_event_on_db_failure(client: TestClient) -> None:
+    state = client.app.state
+    saved_db = state.db
+    state.db = _FailingInsertDB()
+    try:
+        payload = {"items": ["Stream text whose insert fails."]}
+        res = client.post("/api/analyze/stream", json=payload)
+    finally:
+        state.db = saved_db
+    assert res.status_code == 200
+    assert res.text.startswith("event: error\nid: 0\ndata: ")
+
+
+def test_analyze_stream_cancels_pending_work_on_disconnect() -> None:
+    cancelled = asyncio.Event()
+
+    class _SlowLLM:
+        async def analyze_all(self, text: str) -> dict:
+            if text.startswith("Slow"):
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return {"summary": "Quick summary.", "topics": ["a", "b", "c"]}
+
+    async def run() -> None:
+        payload = AnalyzeRequest(items=["Quick text about caches.", "Slow text about queues."])
+        response = await analyze_stream(
+            payload, InMemoryDB(), _SlowLLM(), OrderedDict(), asyncio.Semaphore(16)
+        )
+        body = response.body_iterator
+        first = await body.__anext__()
+        assert first.startswith("id: 0\n")
+        await body.aclose()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_confidence_counts_non_latin_words(client: TestClient) -> None:
+    text = "Это короткий текст о базах данных и о том как они работают сегодня"
+    assert len(text.split()) == 13
+    res = client.post("/api/analyze", json={"text": text})
+    assert res.json()["results"][0]["confidence"] == 0.784
+
+
+def test_analyze_batch_limits_concurrent_llm_calls() -> None:
+    running = 0
+    peak = 0
+
+    class _CountingLLM:
+        async def analyze_all(self, text: str) -> dict:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"summary": "Counted.", "topics": ["a", "b", "c"]}
+
+    payload = AnalyzeRequest(items=[f"Concurrency limited text number {i}." for i in range(10)])
+    response = asyncio.run(
+        analyze(payload, InMemoryDB(), _CountingLLM(), OrderedDict(), asyncio.Semaphore(3))
+    )
+    assert len(response.results) == 10
+    assert peak == 3
+
+
+def test_analyze_batch_too_large_error(client: TestClient) -> None:
+    payload = {"items": [f"Text number {i}." for i in range(101)]}
+    res = client.post("/api/analyze", json=payload)
+    assert res.status_code == 400
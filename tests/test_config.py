@@ -0,0 +1,17 @@
+"""Unit tests for application settings parsing."""
+
+import pytest
+
+from app.config import Settings
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [("true", True), ("TRUE", True), ("false", False), ("", False), ("yes", False), ("1", False)],
+)
+def test_flags_only_enable_on_true(monkeypatch: pytest.MonkeyPatch, raw: str, expected: bool) -> None:
+    monkeypatch.setenv("USE_MOCK_LLM", raw)
+    monkeypatch.setenv("USE_INMEM_DB", raw)
+    settings = Settings()
+    assert settings.USE_MOCK_LLM is expected
+    assert settings.USE_INMEM_DB is expected
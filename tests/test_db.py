@@ -0,0 +1,42 @@
+"""Unit tests for the database layer."""
+
+from app.services.db import InMemoryDB, _pg_array_literal
+
+
+def test_inmem_search_by_topic_and_keyword() -> None:
+    db = InMemoryDB()
+    first = db.insert_analysis({"topics": ["AI", "ethics"], "keywords": ["model"]})
+    second = db.insert_analysis({"topics": ["databases"], "keywords": ["ai", "index"]})
+    db.insert_analysis({"topics": ["cooking"], "keywords": ["pasta"]})
+    assert db.search(" Ai ") == [first, second]
+    assert db.search("index") == [second]
+    assert db.search("missing") == []
+    assert len(db.search("")) == 3
+
+
+def test_inmem_insert_analyses_assigns_ids_in_order() -> None:
+    db = InMemoryDB()
+    saved = db.insert_analyses([{"text": "one"}, {"text": "two"}])
+    assert [r["text"] for r in saved] == ["one", "two"]
+    assert all(r["id"] for r in saved)
+    assert db.search("") == saved
+
+
+def test_pg_array_literal_quotes_plain_value() -> None:
+    assert _pg_array_literal("ai") == '{"ai"}'
+
+
+def test_pg_array_literal_keeps_filter_syntax_inside_quotes() -> None:
+    assert _pg_array_literal("a,b") == '{"a,b"}'
+    assert _pg_array_literal("x),keywords.cs.(y") == '{"x),keywords.cs.(y"}'
+
+
+def test_pg_array_literal_escapes_quotes_and_backslashes() -> None:
+    assert _pg_array_literal('say "hi"') == '{"say \\"hi\\""}'
+    assert _pg_array_literal("back\\slash") == '{"back\\\\slash"}'
+    assert _pg_array_literal('\\"') == '{"\\\\\\""}'
+
+
+def test_pg_array_literal_drops_braces() -> None:
+    assert _pg_array_literal("{ai}") == '{"ai"}'
+    assert _pg_array_literal('x"},topics.cs.{"y') == '{"x\\",topics.cs.\\"y"}'
@@ -13,4 +13,26 @@ def test_keywords_basic() -> None:
 
 def test_keywords_empty() -> None:
     assert extract_top3_nouns_like("") == []
-    assert extract_top3_nouns_like("   ") == []
\ No newline at end of file
+    assert extract_top3_nouns_like("   ") == []
+
+
+def test_keywords_strip_possessives() -> None:
+    assert extract_top3_nouns_like("Paris's museums") == ["paris", "museums"]
+    assert extract_top3_nouns_like("Paris’s museums") == ["paris", "museums"]
+
+
+def test_keywords_possessive_keeps_capitalization_bonus() -> None:
+    # "oslo" outranks "harbor" only through the capitalization bonus.
+    assert extract_top3_nouns_like("Oslo's harbor") == ["oslo", "harbor"]
+
+
+def test_keywords_trailing_apostrophe() -> None:
+    assert extract_top3_nouns_like("The students' lounge") == ["students", "lounge"]
+
+
+def test_keywords_split_contractions_at_apostrophe() -> None:
+    assert extract_top3_nouns_like("It isn't working") == ["working"]
+    text = "It wasn't ready and it isn't ready and it didn't ship"
+    assert extract_top3_nouns_like(text) == ["ready", "ship"]
+    assert extract_top3_nouns_like("We don't deploy") == []
+    assert extract_top3_nouns_like("O'Reilly books") == ["reilly", "books"]
@@ -0,0 +1,71 @@
+"""Unit tests for parsing and normalizing LLM responses."""
+
+import asyncio
+
+import pytest
+
+from app.services.llm import LLMClient, _normalize_metadata, _parse_json_response
+
+
+def _client_replying(raw: str) -> LLMClient:
+    client = LLMClient()
+    client.use_mock = False
+
+    async def generate(prompt: str, text: str) -> str:
+        return raw
+
+    client._generate = generate
+    return client
+
+
+def test_parse_fenced_json() -> None:
+    assert _parse_json_response('```json\n{"title": "T"}\n```') == {"title": "T"}
+
+
+def test_parse_uppercase_tagged_fence() -> None:
+    assert _parse_json_response('```JSON\n{"title": "T"}\n```') == {"title": "T"}
+
+
+def test_parse_untagged_fence_and_unfenced() -> None:
+    assert _parse_json_response('```\n{"a": 1}\n```') == {"a": 1}
+    assert _parse_json_response('{"a": 1}') == {"a": 1}
+
+
+def test_parse_raw_newline_in_string_falls_back_to_lenient_parser() -> None:
+    raw = '```json\n{"summary": "line one\nline two"}\n```'
+    assert _parse_json_response(raw) == {"summary": "line one\nline two"}
+
+
+def test_normalize_metadata_fills_and_coerces() -> None:
+    data = {"title": 5, "topics": ["ai", 3], "sentiment": "angry"}
+    assert _normalize_metadata(data) == {
+        "title": None,
+        "topics": ["ai", "general", "general"],
+        "sentiment": "neutral",
+    }
+
+
+def test_normalize_metadata_truncates_topics() -> None:
+    data = {"title": "T", "topics": ["a", "b", "c", "d"], "sentiment": "positive"}
+    assert _normalize_metadata(data) == {
+        "title": "T",
+        "topics": ["a", "b", "c"],
+        "sentiment": "positive",
+    }
+
+
+def test_analyze_all_parses_fenced_reply() -> None:
+    raw = '```json\n{"summary": " Short. ", "title": null, "topics": ["x"], "sentiment": "negative"}\n```'
+    result = asyncio.run(_client_replying(raw).analyze_all("text"))
+    assert result == {
+        "summary": "Short.",
+        "title": None,
+        "topics": ["x", "general", "general"],
+        "sentiment": "negative",
+    }
+
+
+def test_analyze_all_rejects_missing_summary() -> None:
+    client = _client_replying('{"title": "T", "topics": [], "sentiment": "neutral"}')
+    with pytest.raises(ValueError):
+        asyncio.run(client.analyze_all("text"))